@@ -4,10 +4,21 @@
 # Uses Quine-McCluskey algorithm and Karnaugh map principles
 # Generates optimized Boolean expressions in SOP form
 
+import functools
 import itertools
 from typing import List, Set, Tuple, Dict
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the QM kernel runs as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # ========================================================================
 # PART 1: DEFINE CONTROL SIGNAL TRUTH TABLES
 # ========================================================================
@@ -25,6 +36,9 @@ opcodes = {
     'I_JALR':   0b1100111,  # JALR
 }
 
+# Reverse lookup: opcode value -> name
+OPCODE_TO_NAME = {v: k for k, v in opcodes.items()}
+
 # Funct3 for branches
 funct3_branch = {
     'BEQ': 0b000,
@@ -42,6 +56,7 @@ def build_truth_table():
     Build complete truth table for all control signals
     Inputs: opcode[6:0], funct3[2:0], funct7[6]
     Outputs: All control signals
+    Returns one np.uint8 column per field, indexed by row
     """
     truth_table = []
     
@@ -178,134 +193,160 @@ def build_truth_table():
             }
             truth_table.append(row)
     
-    return truth_table
+    # Store column-wise so each signal can be filtered with one array op
+    return {
+        field: np.array([row[field] for row in truth_table], dtype=np.uint8)
+        for field in truth_table[0]
+    }
+
+def build_opcode_tables(truth_table, signals, width=7):
+    """
+    Expand the truth table into one 2^width entry array per signal
+    Entry [opcode] is 1 if any row with that opcode sets the signal, else 0
+    """
+    tables = {}
+    for signal in signals:
+        table = np.zeros(1 << width, dtype=np.int8)
+        # Opcodes repeat across funct rows; any row driving a 1 counts
+        table[truth_table['opcode'][truth_table[signal] == 1]] = 1
+        tables[signal] = table
+    return tables
 
 # ========================================================================
 # PART 3: QUINE-MCCLUSKEY MINIMIZATION
 # ========================================================================
 
-def decimal_to_binary(n, width):
-    """Convert decimal to binary string of fixed width"""
-    return format(n, f'0{width}b')
-
-def hamming_distance(s1, s2):
-    """Calculate Hamming distance between two binary strings"""
-    return sum(c1 != c2 for c1, c2 in zip(s1, s2))
-
-def combine_minterms(m1, m2):
-    """Combine two minterms if they differ by one bit"""
-    if hamming_distance(m1, m2) != 1:
-        return None
-    
-    result = []
-    for c1, c2 in zip(m1, m2):
-        if c1 == c2:
-            result.append(c1)
+# Literal names for opcode[6:0], MSB first
+_VAR_POS = ('op6', 'op5', 'op4', 'op3', 'op2', 'op1', 'op0')
+_VAR_NEG = tuple('~' + v for v in _VAR_POS)
+
+def implicant_to_string(implicant, width):
+    """Convert a (value, mask) implicant to a '0'/'1'/'-' string, MSB first"""
+    value, mask = implicant
+    chars = []
+    for i in range(width - 1, -1, -1):
+        bit = 1 << i
+        if mask & bit:
+            chars.append('-')
         else:
-            result.append('-')  # Don't care
-    return ''.join(result)
+            chars.append('1' if value & bit else '0')
+    return ''.join(chars)
 
-def quine_mccluskey(minterms: List[int], num_vars: int) -> List[str]:
+@njit(cache=True)
+def combine_pass(values, masks, num_vars, new_values, new_masks, used):
+    """
+    One Quine-McCluskey combine pass over uint32 (value, mask) arrays
+    Writes combined implicants into new_values/new_masks and marks input
+    implicant i as used by setting bit i of the packed bitset used
+    (little-endian bit order); the buffers are reused across passes
+    Returns the number of combined implicants written
+    """
+    n = len(values)
+    used[:(n + 7) >> 3] = 0
+    
+    # Index implicants by (mask, value) so each partner lookup is a
+    # binary search instead of a scan over every other implicant
+    keys = (masks.astype(np.int64) << 32) | values.astype(np.int64)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    
+    count = 0
+    all_bits = (np.int64(1) << num_vars) - 1
+    
+    for i in range(n):
+        value = np.int64(values[i])
+        mask = np.int64(masks[i])
+        
+        # Walk only the bits that are 0 and not don't-care, lowest first
+        free = all_bits & ~(value | mask)
+        while free:
+            bit = free & -free
+            free &= free - 1
+            
+            # Partner has the same mask and differs only by setting this bit
+            partner = (mask << 32) | (value | bit)
+            j = np.searchsorted(sorted_keys, partner)
+            if j < n and sorted_keys[j] == partner:
+                used[i >> 3] |= 1 << (i & 7)
+                used[order[j] >> 3] |= 1 << (order[j] & 7)
+                new_values[count] = value
+                new_masks[count] = mask | bit
+                count += 1
+    
+    return count
+
+@functools.lru_cache(maxsize=256)
+def quine_mccluskey(minterms: Tuple[int, ...], num_vars: int) -> Tuple[Tuple[int, int], ...]:
     """
     Quine-McCluskey algorithm for 2-level minimization
-    Returns list of prime implicants
+    Minterms are passed as a sorted tuple so results can be cached;
+    signals with identical minterms (e.g. MemRead/MemToReg) share one run
+    Returns tuple of prime implicants as (value, mask) pairs, in the
+    order they were found; callers sort if they need a stable order
     """
     if not minterms:
-        return []
-    
-    # Convert to binary strings
-    binary_minterms = [decimal_to_binary(m, num_vars) for m in minterms]
-    
-    # Group by number of 1s
-    groups = {}
-    for bm in binary_minterms:
-        ones = bm.count('1')
-        if ones not in groups:
-            groups[ones] = []
-        groups[ones].append(bm)
-    
-    # Iteratively combine
-    prime_implicants = set()
-    used = set()
-    
-    while True:
-        new_groups = {}
-        combined_any = False
+        return ()
+    
+    # A single minterm is its own (and only) prime implicant
+    if len(minterms) == 1:
+        return ((minterms[0], 0),)
+    
+    # Each minterm starts as an implicant with no don't-care bits
+    values = np.unique(np.asarray(minterms, dtype=np.uint32))
+    masks = np.zeros_like(values)
+    
+    # Scratch buffers shared by every pass; grown only when a level
+    # could produce more implicants than they hold
+    capacity = 0
+    new_values = new_masks = used = None
+    
+    # Iteratively combine; dict keys keep level order and drop duplicates
+    prime_implicants: Dict[Tuple[int, int], None] = {}
+    
+    while len(values):
+        needed = max(len(values) * num_vars, len(values))
+        if needed > capacity:
+            capacity = needed
+            new_values = np.empty(capacity, dtype=np.uint32)
+            new_masks = np.empty(capacity, dtype=np.uint32)
+            used = np.empty((capacity + 7) >> 3, dtype=np.uint8)
         
-        # Try to combine adjacent groups
-        for i in sorted(groups.keys()):
-            if i + 1 not in groups:
-                continue
-            
-            for m1 in groups[i]:
-                for m2 in groups[i + 1]:
-                    combined = combine_minterms(m1, m2)
-                    if combined:
-                        combined_any = True
-                        used.add(m1)
-                        used.add(m2)
-                        
-                        ones = combined.count('1')
-                        if ones not in new_groups:
-                            new_groups[ones] = []
-                        if combined not in new_groups[ones]:
-                            new_groups[ones].append(combined)
+        count = combine_pass(values, masks, num_vars, new_values, new_masks, used)
         
         # Add unused terms as prime implicants
-        for group in groups.values():
-            for term in group:
-                if term not in used:
-                    prime_implicants.add(term)
+        used_flags = np.unpackbits(used, count=len(values), bitorder='little')
+        for i in np.flatnonzero(used_flags == 0):
+            prime_implicants[(int(values[i]), int(masks[i]))] = None
         
-        if not combined_any:
-            break
-        
-        groups = new_groups
-        used = set()
-    
-    # Add final terms
-    for group in groups.values():
-        for term in group:
-            prime_implicants.add(term)
+        # The same implicant can be produced by more than one pair
+        keys = np.unique((new_masks[:count].astype(np.int64) << 32) | new_values[:count])
+        values = (keys & 0xFFFFFFFF).astype(np.uint32)
+        masks = (keys >> 32).astype(np.uint32)
     
-    return sorted(prime_implicants)
+    return tuple(prime_implicants)
 
-def minimize_control_signal(truth_table: List[Dict], signal_name: str) -> str:
+def minimize_control_signal(minterms: List[int]) -> str:
     """
     Minimize a single control signal using Quine-McCluskey
+    Takes the opcodes where the signal is 1
     Returns optimized SOP expression
     """
-    # Extract minterms where signal is 1
-    minterms = []
-    
-    for i, row in enumerate(truth_table):
-        if row[signal_name] == 1:
-            # Combine opcode, funct3, funct7_5 into single binary number
-            # We'll use simplified encoding: just opcode[6:0] for now
-            minterm = row['opcode']
-            minterms.append(minterm)
-    
-    # Remove duplicates
-    minterms = list(set(minterms))
-    
     if not minterms:
         return "0"
     
     # Apply Quine-McCluskey
-    prime_implicants = quine_mccluskey(minterms, 7)  # 7 bits for opcode
+    prime_implicants = list(quine_mccluskey(tuple(sorted(minterms)), 7))  # 7 bits for opcode
+    prime_implicants = sorted(implicant_to_string(pi, 7) for pi in prime_implicants)
     
     # Convert prime implicants to Boolean expression
     terms = []
-    var_names = ['op6', 'op5', 'op4', 'op3', 'op2', 'op1', 'op0']
     
     for pi in prime_implicants:
         literals = []
         for i, bit in enumerate(pi):
-            if bit == '1':
-                literals.append(var_names[i])
-            elif bit == '0':
-                literals.append(f"~{var_names[i]}")
-            # '-' means don't care, skip
+            if bit == '-':
+                continue  # Don't care, skip
+            literals.append(_VAR_POS[i] if bit == '1' else _VAR_NEG[i])
         
         if literals:
             terms.append(' & '.join(literals))
@@ -316,8 +357,12 @@ def minimize_control_signal(truth_table: List[Dict], signal_name: str) -> str:
 # PART 4: OPTIMIZE ALL CONTROL SIGNALS
 # ========================================================================
 
-def optimize_all_signals():
-    """Optimize all control signals and generate report"""
+@functools.lru_cache(maxsize=1)
+def _optimize_signals():
+    """
+    Minimize every control signal once
+    Cached so repeated reports do not rerun Quine-McCluskey
+    """
     
     truth_table = build_truth_table()
     
@@ -326,46 +371,22 @@ def optimize_all_signals():
         'MemToReg', 'Branch', 'Jump'
     ]
     
-    results = {}
+    # We'll use simplified encoding: just opcode[6:0] for now
+    tables = build_opcode_tables(truth_table, control_signals)
     
-    print("=" * 80)
-    print("2-LEVEL LOGIC OPTIMIZATION RESULTS")
-    print("=" * 80)
-    print()
+    results = {}
     
     for signal in control_signals:
-        print(f"\n{'='*60}")
-        print(f"Signal: {signal}")
-        print(f"{'='*60}")
-        
         # Get minterms
-        minterms = []
-        for row in truth_table:
-            if row[signal] == 1:
-                minterms.append(row['opcode'])
-        
-        minterms = sorted(set(minterms))
-        
-        print(f"Minterms (opcodes where {signal}=1):")
-        for m in minterms:
-            opcode_name = [k for k, v in opcodes.items() if v == m]
-            print(f"  {m:07b} (0x{m:02x}) - {opcode_name[0] if opcode_name else 'UNKNOWN'}")
+        minterms = np.flatnonzero(tables[signal] == 1).tolist()
         
         # Optimize
-        optimized = minimize_control_signal(truth_table, signal)
-        
-        print(f"\nOptimized SOP Expression:")
-        print(f"  {signal} = {optimized}")
+        optimized = minimize_control_signal(minterms)
         
         # Calculate savings
         original_terms = len(minterms)
         optimized_terms = optimized.count('|') + 1 if optimized != "0" else 0
         
-        print(f"\nOptimization Statistics:")
-        print(f"  Original minterms: {original_terms}")
-        print(f"  Optimized terms: {optimized_terms}")
-        print(f"  Reduction: {original_terms - optimized_terms} terms")
-        
         results[signal] = {
             'minterms': minterms,
             'expression': optimized,
@@ -375,6 +396,41 @@ def optimize_all_signals():
     
     return results
 
+def optimize_all_signals(verbose=True):
+    """Optimize all control signals and generate report"""
+    
+    results = _optimize_signals()
+    
+    if verbose:
+        print("=" * 80)
+        print("2-LEVEL LOGIC OPTIMIZATION RESULTS")
+        print("=" * 80)
+        print()
+        
+        for signal, res in results.items():
+            print(f"\n{'='*60}")
+            print(f"Signal: {signal}")
+            print(f"{'='*60}")
+            
+            print(f"Minterms (opcodes where {signal}=1):")
+            for m in res['minterms']:
+                print(f"  {m:07b} (0x{m:02x}) - {OPCODE_TO_NAME.get(m, 'UNKNOWN')}")
+            
+            print(f"\nOptimized SOP Expression:")
+            print(f"  {signal} = {res['expression']}")
+            
+            original_terms = res['original_terms']
+            optimized_terms = res['optimized_terms']
+            
+            print(f"\nOptimization Statistics:")
+            print(f"  Original minterms: {original_terms}")
+            print(f"  Optimized terms: {optimized_terms}")
+            print(f"  Reduction: {original_terms - optimized_terms} terms")
+    
+    # Copy so callers cannot modify the cached results
+    return {signal: dict(res, minterms=list(res['minterms']))
+            for signal, res in results.items()}
+
 # ========================================================================
 # PART 5: MANUAL OPTIMIZATION WITH KARNAUGH MAPS
 # ========================================================================
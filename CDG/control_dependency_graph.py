@@ -130,100 +130,151 @@ nodes = sorted(set(adj.keys()) | {v for values in adj.values() for v in values})
 # Create index mapping
 idx = {node: i for i, node in enumerate(nodes)}
 
+# Edge u -> v as parallel row/column index arrays
+rows = np.fromiter((idx[u] for u, vs in adj.items() for _ in vs), dtype=np.int32)
+cols = np.fromiter((idx[v] for vs in adj.values() for v in vs), dtype=np.int32)
+
 # Create NxN matrix
 N = len(nodes)
-matrix = np.zeros((N, N), dtype=int)
+matrix = np.zeros((N, N), dtype=np.uint8)
 
 # Fill matrix: edge u -> v means matrix[u][v] = 1
-for u in adj:
-    for v in adj[u]:
-        matrix[idx[u], idx[v]] = 1
+matrix[rows, cols] = 1
 
 # Print the matrix
+df = pd.DataFrame(matrix, index=nodes, columns=nodes)
 print("Adjacency Matrix:\n")
-print(pd.DataFrame(matrix, index=nodes, columns=nodes))
+print(df)
 
 # Save to CSV
-pd.DataFrame(matrix, index=nodes, columns=nodes).to_csv("CDG_Adjacency_Matrix.csv")
+df.to_csv("CDG_Adjacency_Matrix.csv")
 
-# Save to TXT
+# Save to TXT (same aligned layout as DataFrame.to_string, written row by row)
+label_width = max(len(n) for n in nodes)
+row_fmt = f"{{:<{label_width}}}" + "".join(f"  {{:>{len(n)}}}" for n in nodes)
 with open("CDG_Adjacency_Matrix.txt", "w") as f:
-    f.write(pd.DataFrame(matrix, index=nodes, columns=nodes).to_string())
+    f.write(" " * label_width + "".join(f"  {n}" for n in nodes))
+    for node, row in zip(nodes, matrix.tolist()):
+        f.write("\n" + row_fmt.format(node, *row))
 
 print("\nFiles saved: CDG_Adjacency_Matrix.csv and CDG_Adjacency_Matrix.txt")
-import networkx as nx
-import matplotlib.pyplot as plt
+import argparse
+import hashlib
+import inspect
+import os
 import textwrap
 
-# --------------------------
-# Build graph from adjacency list
-# --------------------------
-G = nx.DiGraph()
-for u in adj_list:
-    for v in adj_list[u]:
-        G.add_edge(u, v)
-
-# --------------------------
-# Assign each node to a pipeline stage column
-# --------------------------
-stage_x = {"IF": 0, "ID": 1, "EX": 2, "MEM": 3, "WB": 4}
-y_count = {"IF": 0, "ID": 0, "EX": 0, "MEM": 0, "WB": 0}
-
-pos = {}
-node_colors = []
-
-colors = {
-    "IF": "#F4B183",
-    "ID": "#A9D08E",
-    "EX": "#FFD966",
-    "MEM": "#9BC2E6",
-    "WB": "#CDA0D9",
-}
 
-# Place nodes cleanly in layers
-for node in sorted(G.nodes()):
-    stage = node.split(":")[0]
-    x = stage_x[stage]
-    y = -y_count[stage] * 2.0 - 2    # shifted down to prevent graph top cutoff
-    y_count[stage] += 1
-
-    pos[node] = (x, y)
-    node_colors.append(colors[stage])
-
-# Wrap long labels
-labels = {n: "\n".join(textwrap.wrap(n, width=18)) for n in G.nodes()}
-
-# --------------------------
-# DRAW CLEAN, GLITCH-FREE CDG
-# --------------------------
-plt.figure(figsize=(26, 32))
-
-nx.draw_networkx_nodes(G, pos,
-                       node_color=node_colors,
-                       edgecolors="black",
-                       node_size=4200)
-
-nx.draw_networkx_edges(G, pos,
-                       arrows=True,
-                       arrowsize=16,
-                       connectionstyle="arc3,rad=0.15",
-                       width=1.1)
-
-nx.draw_networkx_labels(G, pos,
-                        labels,
-                        font_size=9)
-
-# --------------------------
-# Draw Stage Titles (Moved FAR Above)
-# --------------------------
-for stage, x in stage_x.items():
-    plt.text(x, 4.5, stage, fontsize=22, fontweight="bold", ha="center")
-
-plt.title("Control Dependency Graph (Clean Layered View)", fontsize=28, pad=40)
-
-plt.axis("off")
-plt.tight_layout(rect=[0, 0, 1, 0.97])   # extra top padding → removes glitch
-plt.savefig("CDG_Clean_Layered.png", dpi=330)
-plt.show()
-
-print("Clean CDG saved as CDG_Clean_Layered.png")
\ No newline at end of file
+def adj_list_hash(adj_list, dpi):
+    """Short content hash of the graph, resolution and drawing code, used to
+    name the PNG"""
+    key = repr((sorted((k, tuple(v)) for k, v in adj_list.items()), dpi,
+                inspect.getsource(draw_cdg)))
+    return hashlib.blake2b(key.encode()).hexdigest()[:12]
+
+
+def draw_cdg(adj_list, path, dpi=150):
+    """Draw the layered CDG and save it to path"""
+    # Plotting stack is only imported when a drawing is actually rendered
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
+    # --------------------------
+    # Build graph from adjacency list
+    # --------------------------
+    G = nx.DiGraph()
+    for u in adj_list:
+        for v in adj_list[u]:
+            G.add_edge(u, v)
+
+    # --------------------------
+    # Assign each node to a pipeline stage column
+    # --------------------------
+    stage_x = {"IF": 0, "ID": 1, "EX": 2, "MEM": 3, "WB": 4}
+    y_count = {"IF": 0, "ID": 0, "EX": 0, "MEM": 0, "WB": 0}
+
+    pos = {}
+    node_colors = []
+
+    colors = {
+        "IF": "#F4B183",
+        "ID": "#A9D08E",
+        "EX": "#FFD966",
+        "MEM": "#9BC2E6",
+        "WB": "#CDA0D9",
+    }
+
+    # Place nodes cleanly in layers
+    for node in sorted(G.nodes()):
+        stage = node.split(":")[0]
+        x = stage_x[stage]
+        y = -y_count[stage] * 2.0 - 2    # shifted down to prevent graph top cutoff
+        y_count[stage] += 1
+
+        pos[node] = (x, y)
+        node_colors.append(colors[stage])
+
+    # Wrap long labels
+    labels = {n: "\n".join(textwrap.wrap(n, width=18)) for n in G.nodes()}
+
+    # --------------------------
+    # DRAW CLEAN, GLITCH-FREE CDG
+    # --------------------------
+    plt.figure(figsize=(26, 32))
+
+    nx.draw_networkx_nodes(G, pos,
+                           node_color=node_colors,
+                           edgecolors="black",
+                           node_size=4200)
+
+    nx.draw_networkx_edges(G, pos,
+                           arrows=True,
+                           arrowsize=16,
+                           connectionstyle="arc3,rad=0.15",
+                           width=1.1)
+
+    nx.draw_networkx_labels(G, pos,
+                            labels,
+                            font_size=9)
+
+    # --------------------------
+    # Draw Stage Titles (Moved FAR Above)
+    # --------------------------
+    for stage, x in stage_x.items():
+        plt.text(x, 4.5, stage, fontsize=22, fontweight="bold", ha="center")
+
+    plt.title("Control Dependency Graph (Clean Layered View)", fontsize=28, pad=40)
+
+    plt.axis("off")
+    plt.tight_layout(rect=[0, 0, 1, 0.97])   # extra top padding → removes glitch
+    plt.savefig(path, dpi=dpi)
+    plt.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Control dependency graph export")
+    parser.add_argument("--draw", action="store_true",
+                        help="render the layered CDG as a PNG")
+    parser.add_argument("--dpi", type=int, default=150,
+                        help="PNG resolution (330 for print quality)")
+    args = parser.parse_args()
+
+    if args.draw:
+        # Reuse an existing drawing of the same graph at the same resolution
+        png = f"CDG_Clean_Layered_{adj_list_hash(adj_list, args.dpi)}.png"
+        if os.path.exists(png):
+            print(f"CDG unchanged, reusing {png}")
+        else:
+            draw_cdg(adj_list, png, dpi=args.dpi)
+            print(f"Clean CDG saved as {png}")
+
+            # Replace the drawing this script wrote last time, and only that
+            # one, so older graphs/resolutions don't pile up
+            marker = ".CDG_Clean_Layered.last"
+            if os.path.exists(marker):
+                with open(marker) as f:
+                    previous = f.read()
+                if previous != png and os.path.exists(previous):
+                    os.remove(previous)
+            with open(marker, "w") as f:
+                f.write(png)
@@ -3,7 +3,21 @@
 # Also require Graphviz system installed and on PATH (dot.exe)
 
 from graphviz import Digraph
-import json
+import hashlib
+import os
+
+
+def is_current(path, marker, digest):
+    """True if path exists and marker records it was written from digest"""
+    if not (os.path.exists(path) and os.path.exists(marker)):
+        return False
+    with open(marker) as f:
+        return f.read() == digest
+
+
+def content_digest(content):
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
 
 # --------------------------
 # Build Graphviz diagram
@@ -145,9 +159,17 @@ dot.edge("IF_ID", "ID_EX", style="invis")
 dot.edge("ID_EX", "EX_MEM", style="invis")
 dot.edge("EX_MEM", "MEM_WB", style="invis")
 
-# Render diagram
-dot.render(cleanup=True)
-print("Generated diagram: mips_datapath.svg")
+# Render diagram straight to the SVG (no intermediate .gv source file);
+# skip the dot subprocess when the diagram source is unchanged
+dot_hash = content_digest(dot.source)
+if is_current("mips_datapath.svg", ".mips_datapath.hash", dot_hash):
+    print("Diagram unchanged: mips_datapath.svg")
+else:
+    with open("mips_datapath.svg", "wb") as f:
+        f.write(dot.pipe(format="svg"))
+    with open(".mips_datapath.hash", "w") as f:
+        f.write(dot_hash)
+    print("Generated diagram: mips_datapath.svg")
 
 # --------------------------
 # Resource map (text output)
@@ -198,10 +220,23 @@ resource_map = {
     "ForwardingUnit":    "ForwardUnit",
 }
 
-# Write map
-with open("resource_map.txt", "w") as f:
-    f.write("MIPS Pipeline Resource Map\n")
-    f.write("==========================\n\n")
-    json.dump(resource_map, f, indent=2)
-
-print("Wrote resource_map.txt")
+# Write map as flat resource<TAB>unit rows; nested groups become dotted keys
+rows = ["resource\tunit\n"]
+for key, unit in resource_map.items():
+    if isinstance(unit, dict):
+        rows += [f"{key}.{sub}\t{u}\n" for sub, u in unit.items()]
+    else:
+        rows.append(f"{key}\t{unit}\n")
+map_text = "".join(rows)
+
+# Only rewrite when its contents changed
+map_hash = content_digest(map_text)
+if is_current("resource_map.txt", ".resource_map.hash", map_hash):
+    print("Resource map unchanged: resource_map.txt")
+else:
+    with open("resource_map.txt", "w") as f:
+        f.write(map_text)
+    with open(".resource_map.hash", "w") as f:
+        f.write(map_hash)
+
+    print("Wrote resource_map.txt")
@@ -1,9 +1,24 @@
 # ======================================================================
 # CORRECTED PIPELINE CONTROL SIGNAL SCHEDULER WITH FDS ALGORITHM
 # ======================================================================
+import csv
+import hashlib
+import inspect
+import multiprocessing
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
 import networkx as nx
+import matplotlib
+matplotlib.use('Agg')  # Charts are only saved to files; no GUI backend needed
 import matplotlib.pyplot as plt
-import pandas as pd
+from matplotlib.collections import PatchCollection
+from matplotlib.patches import Rectangle
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
 
 # ============================================================================
 # CRITICAL FIX: Remove time indices - treat each signal as SINGLE operation
@@ -86,79 +101,95 @@ G.add_edges_from(edges)
 print(f"Total nodes (control signals): {G.number_of_nodes()}")
 print(f"Total edges (dependencies): {G.number_of_edges()}")
 
-# Check for cycles (should be acyclic for scheduling)
-if not nx.is_directed_acyclic_graph(G):
+# Check for cycles (should be acyclic for scheduling); the topological
+# order found here is reused by ASAP/ALAP below
+try:
+    topo = list(nx.topological_sort(G))
+except nx.NetworkXUnfeasible:
     print("ERROR: Graph has cycles!")
-    cycles = list(nx.simple_cycles(G))
-    print(f"Cycles found: {cycles}")
-else:
-    print("✓ Graph is acyclic (valid for scheduling)")
+    # One witness cycle is enough; simple_cycles can be exponential
+    print(f"Example cycle: {nx.find_cycle(G)}")
+    raise
+print("✓ Graph is acyclic (valid for scheduling)")
 
 # ------------------------------------------------------------
 # 3) ASAP Scheduling (As-Soon-As-Possible)
 # ------------------------------------------------------------
-ASAP = {}
-for node in nx.topological_sort(G):
-    preds = list(G.predecessors(node))
-    if not preds:
-        ASAP[node] = 0  # Root nodes start at step 0
-    else:
-        ASAP[node] = max(ASAP[p] + 1 for p in preds)
+# Integer node ids in topological order; the numeric scheduling runs on a
+# sparse adjacency matrix and G is kept for drawing
+node_id = {n: i for i, n in enumerate(topo)}
+N = len(topo)
+
+# Edges come from G so a pair listed twice in `edges` stays a single unit
+# edge (CSR construction would sum the duplicates into weight -2)
+src = np.array([node_id[u] for u, v in G.edges()], dtype=np.int32)
+dst = np.array([node_id[v] for u, v in G.edges()], dtype=np.int32)
+
+# Unit edges weighted -1: shortest paths on A are negated longest paths
+A = sp.csr_matrix((-np.ones(len(src)), (src, dst)), shape=(N, N))
+roots = np.flatnonzero(A.getnnz(axis=0) == 0)
+leaves = np.flatnonzero(A.getnnz(axis=1) == 0)
+
+# Root nodes start at step 0; every other node sits after its longest
+# chain of predecessors
+dist = csgraph.bellman_ford(A, directed=True, indices=roots)
+asap = (-dist.min(axis=0)).astype(np.int32)
 
 # ------------------------------------------------------------
 # 4) ALAP Scheduling (As-Late-As-Possible)
 # ------------------------------------------------------------
-max_asap = max(ASAP.values())
+max_asap = int(asap.max())
 print(f"\nCritical path length (max ASAP): {max_asap} steps")
 
-ALAP = {}
-# Process in reverse topological order
-for node in reversed(list(nx.topological_sort(G))):
-    succs = list(G.successors(node))
-    if not succs:
-        ALAP[node] = max_asap  # Leaf nodes at latest time
-    else:
-        ALAP[node] = min(ALAP[s] - 1 for s in succs)
+# Mirror of ASAP on the reversed graph: leaf nodes at latest time, every
+# other node pulled earlier by its longest chain of successors
+dist = csgraph.bellman_ford(A.T.tocsr(), directed=True, indices=leaves)
+alap = (max_asap + dist.min(axis=0)).astype(np.int32)
 
 # ------------------------------------------------------------
 # 5) Slack and Mobility
 # ------------------------------------------------------------
-SLACK = {n: ALAP[n] - ASAP[n] for n in G.nodes()}
-MOBILITY = {n: ALAP[n] - ASAP[n] + 1 for n in G.nodes()}
+slack = alap - asap
+mobility = slack + 1
+
+# Back to per-signal dicts for reporting
+ASAP = dict(zip(topo, asap.tolist()))
+ALAP = dict(zip(topo, alap.tolist()))
+SLACK = dict(zip(topo, slack.tolist()))
+MOBILITY = dict(zip(topo, mobility.tolist()))
 
 print("\nCritical path signals (slack = 0):")
 critical_signals = [n for n in G.nodes() if SLACK[n] == 0]
-for sig in critical_signals:
-    print(f"  {sig}: ASAP={ASAP[sig]}, ALAP={ALAP[sig]}")
+sys.stdout.write("".join(f"  {sig}: ASAP={ASAP[sig]}, ALAP={ALAP[sig]}\n"
+                         for sig in critical_signals))
 
 # ------------------------------------------------------------
 # 6) FDS (Force-Directed Scheduling)
 # ------------------------------------------------------------
-# Calculate probability distribution for each operation
-Prob = {}
-for n in G.nodes():
-    Prob[n] = {}
-    for t in range(max_asap + 1):
-        if ASAP[n] <= t <= ALAP[n]:
-            Prob[n][t] = 1.0 / MOBILITY[n]
-        else:
-            Prob[n][t] = 0.0
+# Ops in G.nodes() order
+fds_nodes = list(G.nodes())
+fds_ids = np.array([node_id[n] for n in fds_nodes], dtype=np.int32)
+fds_asap = asap[fds_ids]
+fds_alap = alap[fds_ids]
+
+# Dense (op, step) probability matrix: each op spreads 1/mobility evenly
+# over its [ASAP, ALAP] window
+steps = np.arange(max_asap + 1)
+window = (steps >= fds_asap[:, None]) & (steps <= fds_alap[:, None])
+Prob = window / (fds_alap - fds_asap + 1)[:, None]
 
 # Calculate distribution cost (forces) for each time step
-Cost = {}
-for t in range(max_asap + 1):
-    Cost[t] = sum(Prob[n][t] for n in G.nodes())
+cost = Prob.sum(axis=0)
+Cost = cost.tolist()  # Indexed by step
 
 print("\nDistribution cost per step:")
-for t in sorted(Cost.keys()):
-    print(f"  Step {t}: {Cost[t]:.2f} operations")
+sys.stdout.write("".join(f"  Step {t}: {c:.2f} operations\n"
+                         for t, c in enumerate(Cost)))
 
-# FDS: Choose time step with minimum cost within valid interval
-FDS_schedule = {}
-for n in G.nodes():
-    valid_steps = range(ASAP[n], ALAP[n] + 1)
-    best_step = min(valid_steps, key=lambda t: Cost[t])
-    FDS_schedule[n] = best_step
+# FDS: Choose time step with minimum cost within valid interval (argmin
+# returns the earliest step on ties)
+best = np.where(window, cost, np.inf).argmin(axis=1)
+FDS_schedule = dict(zip(fds_nodes, best.tolist()))
 
 # ------------------------------------------------------------
 # 7) Resource Type Classification
@@ -218,6 +249,15 @@ stage_assignment = {
     "MemToReg": "WB",
 }
 
+STAGES = ['IF', 'ID', 'EX', 'MEM', 'WB']
+
+# Signals of each stage in name order, grouped in a single pass
+stage_signals = {stage: [] for stage in STAGES}
+for n in sorted(G.nodes()):
+    stage = stage_assignment.get(n)
+    if stage in stage_signals:
+        stage_signals[stage].append(n)
+
 # ------------------------------------------------------------
 # 9) Create Comprehensive Output Table
 # ------------------------------------------------------------
@@ -235,66 +275,65 @@ for node in sorted(G.nodes(), key=lambda n: (FDS_schedule[n], n)):
         'Critical': 'YES' if SLACK[node] == 0 else 'NO'
     })
 
-df = pd.DataFrame(schedule_data)
+columns = list(schedule_data[0])
 
 # ------------------------------------------------------------
 # 10) Print Results
 # ------------------------------------------------------------
+# Right-aligned columns; numeric columns get one extra space of padding
+widths = {}
+for col in columns:
+    pad = 1 if isinstance(schedule_data[0][col], int) else 0
+    widths[col] = max(len(col), *(len(str(row[col])) for row in schedule_data)) + pad
+
 print("\n" + "="*80)
 print("COMPLETE SCHEDULING RESULTS")
 print("="*80)
-print(df.to_string(index=False))
+print("\n".join(
+    " ".join(f"{str(cells[col]):>{widths[col]}}" for col in columns)
+    for cells in [dict(zip(columns, columns))] + schedule_data
+))
 
 # ------------------------------------------------------------
 # 11) Save to Files
 # ------------------------------------------------------------
 # Save detailed table
-df.to_csv("Complete_Schedule.csv", index=False)
+with open("Complete_Schedule.csv", "w", newline="") as f:
+    writer = csv.DictWriter(f, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(schedule_data)
 print("\n✓ Saved: Complete_Schedule.csv")
 
+# Each report is assembled in memory and written with a single call.
+# schedule_data is already in (FDS step, name) order, so the FDS
+# listing reuses it instead of sorting again.
+rule = "="*60 + "\n"
+
 # Save FDS schedule only
+lines = [rule, "FDS SCHEDULING RESULTS\n", rule, "\n",
+         "Signal                          Step    Resource\n", "-"*60 + "\n"]
+lines += [f"{row['Signal']:30s}  {row['FDS_Step']:4d}    {resource_type.get(row['Signal'], '?')}\n"
+          for row in schedule_data]
+lines += ["\n" + rule, "CRITICAL PATH\n", rule]
+lines += [f"{sig:30s}  Step {ASAP[sig]}\n" for sig in critical_signals]
+lines.append(f"\nTotal critical path delay: {max_asap} steps\n")
 with open("FDS_Schedule.txt", "w") as f:
-    f.write("="*60 + "\n")
-    f.write("FDS SCHEDULING RESULTS\n")
-    f.write("="*60 + "\n\n")
-    f.write("Signal                          Step    Resource\n")
-    f.write("-"*60 + "\n")
-    for node in sorted(FDS_schedule.keys(), key=lambda n: (FDS_schedule[n], n)):
-        step = FDS_schedule[node]
-        res = resource_type.get(node, "?")
-        f.write(f"{node:30s}  {step:4d}    {res}\n")
-    
-    f.write("\n" + "="*60 + "\n")
-    f.write("CRITICAL PATH\n")
-    f.write("="*60 + "\n")
-    for sig in critical_signals:
-        f.write(f"{sig:30s}  Step {ASAP[sig]}\n")
-    
-    f.write(f"\nTotal critical path delay: {max_asap} steps\n")
+    f.write("".join(lines))
 
 print("✓ Saved: FDS_Schedule.txt")
 
 # Save ASAP/ALAP details
+lines = [rule, "ASAP SCHEDULING\n", rule]
+lines += [f"{node:30s}: {ASAP[node]}\n"
+          for node in sorted(ASAP, key=lambda n: (ASAP[n], n))]
+lines += ["\n" + rule, "ALAP SCHEDULING\n", rule]
+lines += [f"{node:30s}: {ALAP[node]}\n"
+          for node in sorted(ALAP, key=lambda n: (ALAP[n], n))]
+lines += ["\n" + rule, "SLACK ANALYSIS\n", rule]
+lines += [f"{node:30s}: {SLACK[node]}{' [CRITICAL]' if SLACK[node] == 0 else ''}\n"
+          for node in sorted(SLACK, key=lambda n: (SLACK[n], n))]
 with open("ASAP_ALAP_Details.txt", "w") as f:
-    f.write("="*60 + "\n")
-    f.write("ASAP SCHEDULING\n")
-    f.write("="*60 + "\n")
-    for node in sorted(ASAP.keys(), key=lambda n: (ASAP[n], n)):
-        f.write(f"{node:30s}: {ASAP[node]}\n")
-    
-    f.write("\n" + "="*60 + "\n")
-    f.write("ALAP SCHEDULING\n")
-    f.write("="*60 + "\n")
-    for node in sorted(ALAP.keys(), key=lambda n: (ALAP[n], n)):
-        f.write(f"{node:30s}: {ALAP[node]}\n")
-    
-    f.write("\n" + "="*60 + "\n")
-    f.write("SLACK ANALYSIS\n")
-    f.write("="*60 + "\n")
-    for node in sorted(SLACK.keys(), key=lambda n: (SLACK[n], n)):
-        slack = SLACK[node]
-        crit = " [CRITICAL]" if slack == 0 else ""
-        f.write(f"{node:30s}: {slack}{crit}\n")
+    f.write("".join(lines))
 
 print("✓ Saved: ASAP_ALAP_Details.txt")
 
@@ -302,10 +341,12 @@ print("✓ Saved: ASAP_ALAP_Details.txt")
 # 12) Visualizations
 # ------------------------------------------------------------
 
-# Visualization 1: Schedule Gantt Chart
-fig, ax = plt.subplots(figsize=(14, 10))
+# Fixed SVG element ids so rerendering identical charts gives identical files
+plt.rcParams['svg.hashsalt'] = 'pipeline_scheduler'
 
-stage_colors = {
+# Each chart is drawn by a top-level function from plain data so it can run
+# in its own worker process
+STAGE_COLORS = {
     'IF': '#F4B183',
     'ID': '#A9D08E',
     'EX': '#FFD966',
@@ -313,96 +354,166 @@ stage_colors = {
     'WB': '#CDA0D9'
 }
 
-y_pos = 0
-signal_positions = {}
 
-for stage in ['IF', 'ID', 'EX', 'MEM', 'WB']:
-    stage_signals = [s for s in sorted(G.nodes()) if stage_assignment.get(s) == stage]
-    
-    for sig in stage_signals:
-        step = FDS_schedule[sig]
-        ax.barh(y_pos, 1, left=step, height=0.8, 
-               color=stage_colors[stage], edgecolor='black', linewidth=0.5)
-        ax.text(step + 0.5, y_pos, sig, va='center', ha='center', fontsize=8)
-        signal_positions[sig] = y_pos
-        y_pos += 1
+def render_gantt(stage_signals, schedule, max_step, path):
+    """Visualization 1: Schedule Gantt Chart"""
+    fig, ax = plt.subplots(figsize=(14, 10))
+
+    y_pos = 0
+    bars = []
+    bar_colors = []
+
+    for stage in STAGES:
+        for sig in stage_signals[stage]:
+            step = schedule[sig]
+            bars.append(Rectangle((step, y_pos - 0.4), 1, 0.8))
+            bar_colors.append(STAGE_COLORS[stage])
+            ax.text(step + 0.5, y_pos, sig, va='center', ha='center', fontsize=8)
+            y_pos += 1
     
-    y_pos += 0.5  # Space between stages
-
-ax.set_yticks([])
-ax.set_xlabel('Time Step', fontsize=12)
-ax.set_title('FDS Schedule - Control Signal Generation Order', fontsize=14, fontweight='bold')
-ax.set_xlim(-0.5, max_asap + 1.5)
-ax.grid(axis='x', alpha=0.3)
-
-# Add stage labels
-y_pos = 0
-for stage in ['IF', 'ID', 'EX', 'MEM', 'WB']:
-    stage_signals = [s for s in sorted(G.nodes()) if stage_assignment.get(s) == stage]
-    if stage_signals:
-        mid_y = y_pos + len(stage_signals) / 2
-        ax.text(-0.8, mid_y, stage, fontsize=11, fontweight='bold', va='center')
-        y_pos += len(stage_signals) + 0.5
-
-plt.tight_layout()
-plt.savefig("FDS_Schedule_Gantt.png", dpi=300, bbox_inches='tight')
-print("✓ Saved: FDS_Schedule_Gantt.png")
-plt.close()
-
-# Visualization 2: Dependency Graph with Scheduling
-pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-
-node_colors = [stage_colors.get(stage_assignment.get(n, 'IF'), '#CCCCCC') for n in G.nodes()]
-node_labels = {n: f"{n}\n[{FDS_schedule[n]}]" for n in G.nodes()}
-
-plt.figure(figsize=(16, 12))
-nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=2000, 
-                       edgecolors='black', linewidths=1.5)
-nx.draw_networkx_edges(G, pos, arrows=True, arrowsize=15, 
-                       edge_color='gray', width=1.5, 
-                       connectionstyle='arc3,rad=0.1')
-nx.draw_networkx_labels(G, pos, node_labels, font_size=7)
-
-plt.title("Control Dependency Graph with FDS Schedule\n[Number] = Scheduled Step", 
-         fontsize=14, fontweight='bold')
-plt.axis('off')
-plt.tight_layout()
-plt.savefig("CDG_with_Schedule.png", dpi=300, bbox_inches='tight')
-print("✓ Saved: CDG_with_Schedule.png")
-plt.close()
-
-# Visualization 3: Resource Utilization per Step
-fig, ax = plt.subplots(figsize=(12, 6))
-
-resource_usage = {}
-for step in range(max_asap + 1):
-    resource_usage[step] = {}
-    for node, scheduled_step in FDS_schedule.items():
-        if scheduled_step == step:
-            res_type = resource_type.get(node, "Unknown")
-            resource_usage[step][res_type] = resource_usage[step].get(res_type, 0) + 1
-
-steps = sorted(resource_usage.keys())
-resource_types = sorted(set(rt for step_res in resource_usage.values() for rt in step_res.keys()))
-
-bottom = [0] * len(steps)
-colors_res = {'Decoder': '#FF9999', 'Comparator': '#66B2FF', 'Logic': '#99FF99', 'Mux': '#FFCC99'}
-
-for res_type in resource_types:
-    values = [resource_usage[step].get(res_type, 0) for step in steps]
-    ax.bar(steps, values, bottom=bottom, label=res_type, 
-           color=colors_res.get(res_type, '#CCCCCC'), edgecolor='black', linewidth=0.5)
-    bottom = [b + v for b, v in zip(bottom, values)]
-
-ax.set_xlabel('Time Step', fontsize=12)
-ax.set_ylabel('Number of Operations', fontsize=12)
-ax.set_title('Resource Utilization per Time Step', fontsize=14, fontweight='bold')
-ax.legend()
-ax.grid(axis='y', alpha=0.3)
-plt.tight_layout()
-plt.savefig("Resource_Utilization.png", dpi=300, bbox_inches='tight')
-print("✓ Saved: Resource_Utilization.png")
-plt.close()
+        y_pos += 0.5  # Space between stages
+
+    # All bars go in as one artist instead of one barh call per signal
+    ax.add_collection(PatchCollection(bars, facecolor=bar_colors,
+                                      edgecolor='black', linewidth=0.5))
+    ax.autoscale_view()
+
+    ax.set_yticks([])
+    ax.set_xlabel('Time Step', fontsize=12)
+    ax.set_title('FDS Schedule - Control Signal Generation Order', fontsize=14, fontweight='bold')
+    ax.set_xlim(-0.5, max_step + 1.5)
+    ax.grid(axis='x', alpha=0.3)
+
+    # Add stage labels
+    y_pos = 0
+    for stage in STAGES:
+        n_signals = len(stage_signals[stage])
+        if n_signals:
+            mid_y = y_pos + n_signals / 2
+            ax.text(-0.8, mid_y, stage, fontsize=11, fontweight='bold', va='center')
+            y_pos += n_signals + 0.5
+
+    fig.tight_layout()
+    fig.savefig(path, bbox_inches='tight', metadata={'Date': None})
+    plt.close(fig)
+    return path
+
+
+def render_cdg(edges, schedule, stage_assignment, path):
+    """Visualization 2: Dependency Graph with Scheduling"""
+    # Layered layout: x = FDS step, y = pipeline stage row
+    stage_y = {'IF': 4, 'ID': 3, 'EX': 2, 'MEM': 1, 'WB': 0}
+    G = nx.DiGraph(edges)
+    cells = {}
+    for n in sorted(G.nodes()):
+        cell = (schedule[n], stage_assignment.get(n, 'IF'))
+        cells.setdefault(cell, []).append(n)
+
+    pos = {}
+    for (step, stage), members in cells.items():
+        mid = (len(members) - 1) / 2
+        for k, n in enumerate(members):
+            # Fan out signals sharing a (step, stage) cell so they don't overlap
+            pos[n] = (step + 0.2 * (k - mid), stage_y[stage] + 0.35 * (k - mid))
+
+    node_colors = [STAGE_COLORS.get(stage_assignment.get(n, 'IF'), '#CCCCCC') for n in G.nodes()]
+    node_labels = {n: f"{n}\n[{schedule[n]}]" for n in G.nodes()}
+
+    fig = plt.figure(figsize=(16, 12))
+    nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=2000, 
+                           edgecolors='black', linewidths=1.5)
+    nx.draw_networkx_edges(G, pos, arrows=True, arrowsize=15, 
+                           edge_color='gray', width=1.5, 
+                           connectionstyle='arc3,rad=0.1')
+    nx.draw_networkx_labels(G, pos, node_labels, font_size=7)
+
+    plt.title("Control Dependency Graph with FDS Schedule\n[Number] = Scheduled Step", 
+             fontsize=14, fontweight='bold')
+    plt.axis('off')
+    fig.tight_layout()
+    fig.savefig(path, bbox_inches='tight', metadata={'Date': None})
+    plt.close(fig)
+    return path
+
+
+def render_utilization(schedule, resource_type, num_steps, path):
+    """Visualization 3: Resource Utilization per Step"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    # Count ops per (step, resource) in one pass over the schedule
+    resource_usage = defaultdict(lambda: defaultdict(int))
+    for node, step in schedule.items():
+        resource_usage[step][resource_type.get(node, "Unknown")] += 1
+
+    steps = list(range(num_steps))
+    resource_types = sorted(set(rt for step_res in resource_usage.values() for rt in step_res.keys()))
+
+    bottom = [0] * len(steps)
+    colors_res = {'Decoder': '#FF9999', 'Comparator': '#66B2FF', 'Logic': '#99FF99', 'Mux': '#FFCC99'}
+
+    for res_type in resource_types:
+        values = [resource_usage[step].get(res_type, 0) for step in steps]
+        ax.bar(steps, values, bottom=bottom, label=res_type, 
+               color=colors_res.get(res_type, '#CCCCCC'), edgecolor='black', linewidth=0.5)
+        bottom = [b + v for b, v in zip(bottom, values)]
+
+    ax.set_xlabel('Time Step', fontsize=12)
+    ax.set_ylabel('Number of Operations', fontsize=12)
+    ax.set_title('Resource Utilization per Time Step', fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path, dpi=120, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def run_renders(jobs):
+    """Run (func, args) jobs in parallel worker processes; return their paths"""
+    # Workers must be forked: spawned ones would re-run this whole script on
+    # import. Fork is only safe on Linux (macOS system frameworks break under
+    # it), so render in-process everywhere else
+    if len(jobs) < 2 or not sys.platform.startswith("linux"):
+        return [func(*args) for func, args in jobs]
+    with ProcessPoolExecutor(len(jobs), mp_context=multiprocessing.get_context("fork")) as ex:
+        futures = [ex.submit(func, *args) for func, args in jobs]
+        return [future.result() for future in futures]
+
+
+def render_digest(func, args):
+    """Content hash of a chart's renderer code, inputs and matplotlib version"""
+    key = repr((inspect.getsource(func), args, matplotlib.__version__))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+# Schematics are vector SVG; set SKIP_PLOTS=1 to skip plotting in batch runs
+if not os.environ.get("SKIP_PLOTS"):
+    jobs = [
+        (render_gantt, (stage_signals, FDS_schedule, max_asap, "FDS_Schedule_Gantt.svg")),
+        (render_cdg, (edges, FDS_schedule, stage_assignment, "CDG_with_Schedule.svg")),
+        (render_utilization, (FDS_schedule, resource_type, max_asap + 1, "Resource_Utilization.png")),
+    ]
+
+    # Only rerender charts whose graph/schedule changed since the last save;
+    # each chart's input hash is kept in a .<file>.hash marker next to it
+    stale = {}
+    for func, args in jobs:
+        path = args[-1]
+        digest = render_digest(func, args)
+        marker = f".{path}.hash"
+        if os.path.exists(path) and os.path.exists(marker):
+            with open(marker) as f:
+                if f.read() == digest:
+                    print(f"✓ Unchanged: {path}")
+                    continue
+        stale[path] = (func, args, marker, digest)
+
+    saved = run_renders([(func, args) for func, args, _, _ in stale.values()])
+    for path in saved:
+        _, _, marker, digest = stale[path]
+        with open(marker, "w") as f:
+            f.write(digest)
+        print(f"✓ Saved: {path}")
 
 # ------------------------------------------------------------
 # 13) Summary Statistics
@@ -415,7 +526,7 @@ print(f"Total dependencies: {len(G.edges())}")
 print(f"Critical path length: {max_asap} steps")
 print(f"Critical signals: {len(critical_signals)}")
 print(f"Average mobility: {sum(MOBILITY.values()) / len(MOBILITY):.2f}")
-print(f"Max step cost: {max(Cost.values()):.2f} operations")
+print(f"Max step cost: {max(Cost):.2f} operations")
 print(f"Estimated delay: {max_asap * 0.3:.2f} ns (@ 0.3ns per step)")
 print(f"Max frequency: {1 / (max_asap * 0.3e-9) / 1e6:.0f} MHz")
 
@@ -425,8 +536,8 @@ print("="*80)
 resource_counts = {}
 for res in resource_type.values():
     resource_counts[res] = resource_counts.get(res, 0) + 1
-for res, count in sorted(resource_counts.items()):
-    print(f"{res:15s}: {count} signals")
+sys.stdout.write("".join(f"{res:15s}: {count} signals\n"
+                         for res, count in sorted(resource_counts.items())))
 
 print("\n✅ All files generated successfully!")
 print("="*80)
\ No newline at end of file